@@ -4,6 +4,11 @@ import pandas as pd
 # Set the title of the application
 st.title("Budget Data Viewer")
 
+# Cache the CSV read so widget interactions don't re-parse the file on every rerun
+@st.cache_data
+def load_budget(path="Budget.csv"):
+    return pd.read_csv(path)
+
 # --- Code to handle the file upload ---
 # You have two main options for hosting your data on Streamlit Cloud:
 
@@ -14,7 +19,7 @@ st.title("Budget Data Viewer")
 try:
     # Assuming 'Budget.csv' is in the same directory as 'app.py'
     file_path = "Budget.csv"
-    df = pd.read_csv(file_path)
+    df = load_budget(file_path)
     st.success(f"Successfully loaded data from the file: {file_path}")
 
 except FileNotFoundError:
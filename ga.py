@@ -1,3 +1,6 @@
+import os
+import pathlib
+import tempfile
 import streamlit as st
 import pandas as pd
 import altair as alt
@@ -10,12 +13,15 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
-# Function to load and clean the data
-@st.cache_data
-def load_and_clean_data(file_path):
-    # Load the data
-    df = pd.read_csv(file_path)
+# Chart data is projected and pre-aggregated before it reaches Altair, so the 5,000-row cap isn't needed
+alt.data_transformers.enable('default', max_rows=None)
 
+# Altair's theme registry (alt.theme on Altair >= 5.5, alt.themes before that)
+altair_themes = alt.theme if hasattr(getattr(alt, 'theme', None), 'enable') else alt.themes
+
+# Function to load and clean the data.
+# Its output is cached as Parquet by get_df: bump CACHE_VERSION whenever this changes the result.
+def load_and_clean_data(file_path):
     # List of financial columns that may contain non-numeric data (like '-')
     finance_cols = [
         'Revenue (Plan)', 'Capital (Plan)', 'Total (Plan)',
@@ -23,30 +29,148 @@ def load_and_clean_data(file_path):
         'Total Plan & Non-Plan'
     ]
 
-    # Convert non-numeric values (like '-') to NaN and then to float, filling NaN with 0
-    for col in finance_cols:
-        # Replace common non-numeric separators/placeholders with NaN
-        df[col] = df[col].replace({'-': np.nan, 'NA': np.nan})
-        # Coerce to numeric, setting errors='coerce' to turn any remaining non-numeric into NaN
-        df[col] = pd.to_numeric(df[col], errors='coerce')
-        # Fill NaN (original or coerced) with 0
-        df[col] = df[col].fillna(0)
+    # Load only the columns the dashboard uses. Ministry Name is low-cardinality, so it is
+    # read straight into a categorical, which makes filtering and grouping cheap.
+    df = pd.read_csv(
+        file_path,
+        usecols=['Year', 'Ministry Name'] + finance_cols,
+        dtype={'Ministry Name': 'category'}
+    )
+
+    # Convert non-numeric values (like '-' or 'NA') to NaN and then to float, filling NaN with 0.
+    # errors='coerce' already turns placeholders into NaN, so the whole block is cleaned in one pass.
+    df[finance_cols] = df[finance_cols].apply(pd.to_numeric, errors='coerce').fillna(0)
     
     # Extract the starting year from the 'Year' column (e.g., '2014-2015' -> 2014)
-    df['Start Year'] = df['Year'].apply(lambda x: int(x.split('-')[0]))
+    # Vectorized string split (no per-row Python lambda); int16 is plenty for a year
+    df['Start Year'] = df['Year'].str.split('-', n=1).str[0].astype('int16')
     
-    # Create a column for Total Budget
-    df['Total Budget (INR Cr)'] = df['Total Plan & Non-Plan']
+    # Expose the grand total as 'Total Budget (INR Cr)' (rename rather than copy the column)
+    df = df.rename(columns={'Total Plan & Non-Plan': 'Total Budget (INR Cr)'})
     
     return df
 
+# Cleaned data is stored as Parquet next to the CSV, so later cold starts skip CSV parsing
+# and cleaning. cache_resource shares the one frame across sessions without pickling it.
+# Bump CACHE_VERSION whenever load_and_clean_data changes its output, so stale files are ignored.
+CACHE_VERSION = 2
+
+@st.cache_resource
+def get_df(file_path):
+    csv_path = pathlib.Path(file_path)
+    parquet_path = csv_path.with_name(f"{csv_path.stem}.v{CACHE_VERSION}.parquet")
+    if parquet_path.exists() and parquet_path.stat().st_mtime >= csv_path.stat().st_mtime:
+        try:
+            return pd.read_parquet(parquet_path)
+        except Exception:
+            # Unreadable cache file: rebuild it from the CSV below
+            pass
+
+    df = load_and_clean_data(file_path)
+    tmp_path = None
+    try:
+        # Write to a temp file in the same directory and swap it in, so an interrupted
+        # write never leaves a truncated file at the final path
+        fd, tmp_path = tempfile.mkstemp(dir=parquet_path.parent, prefix=f"{parquet_path.name}.", suffix='.tmp')
+        os.close(fd)
+        df.to_parquet(tmp_path, compression='zstd')
+        os.replace(tmp_path, parquet_path)
+    except Exception:
+        # The cache is optional: read-only deployments or a pyarrow build without zstd
+        # still work, they just re-parse the CSV on cold start
+        if tmp_path is not None and os.path.exists(tmp_path):
+            os.remove(tmp_path)
+    return df
+
+# KPI totals for the unfiltered dataset, used on the default "All ..." view
+@st.cache_data
+def global_totals(df):
+    return df[['Total Budget (INR Cr)', 'Total (Plan)', 'Total (Non-Plan)']].to_numpy().sum(axis=0)
+
+# Yearly totals across all ministries; depends only on the full dataset, not on the filters.
+# Years are a small dense integer range, so np.bincount replaces a hash-based groupby.
+@st.cache_data
+def trend_by_year(df):
+    years = df['Start Year'].to_numpy()
+    if len(years) == 0:
+        return pd.DataFrame({'Start Year': years[:0], 'Total Budget (INR Cr)': np.zeros(0)})
+    base = years.min()
+    offsets = years - base
+    sums = np.bincount(offsets, weights=df['Total Budget (INR Cr)'].to_numpy())
+    present = np.bincount(offsets) > 0  # skip gaps in the range, as groupby would
+    return pd.DataFrame({
+        'Start Year': np.arange(base, base + len(sums), dtype=years.dtype)[present],
+        'Total Budget (INR Cr)': sums[present],
+    })
+
+# Top 10 ministries by budget for every year, so selecting a year is a dict lookup
+@st.cache_data
+def top10_by_year(df):
+    return {
+        int(year): group.nlargest(10, 'Total Budget (INR Cr)')
+        for year, group in df.groupby('Start Year', sort=False)
+    }
+
+# Plan vs Non-Plan amounts per year for one ministry, summed before melting into long form
+@st.cache_data
+def plan_nonplan_by_year(df, ministry):
+    df_ministry = df.loc[df['Ministry Name'].values == ministry]
+    df_by_year = df_ministry.groupby('Start Year', as_index=False)[['Total (Plan)', 'Total (Non-Plan)']].sum()
+    return df_by_year.melt(
+        id_vars=['Start Year'],
+        value_vars=['Total (Plan)', 'Total (Non-Plan)'],
+        var_name='Type',
+        value_name='Amount'
+    )
+
+# Vega-Lite specs for the charts are cached as plain dicts, so Altair only builds
+# and serializes each chart on the first render of a given filter combination.
+# Like st.altair_chart, specs are built under the "none" theme so Streamlit controls the sizing.
+@st.cache_data
+def trend_spec(df_trend):
+    chart = alt.Chart(df_trend[['Start Year', 'Total Budget (INR Cr)']]).mark_line(point=True).encode(
+        x=alt.X('Start Year:O', title='Financial Year (Start)'),
+        y=alt.Y('Total Budget (INR Cr)', title='Total Budget (INR Crore)'),
+        tooltip=['Start Year', alt.Tooltip('Total Budget (INR Cr)', format=',.2f')]
+    ).properties(
+        title="Total Budget of All Ministries Over Time"
+    ).interactive() # Make the chart zoomable/pannable
+    with altair_themes.enable('none'):
+        return chart.to_dict()
+
+@st.cache_data
+def breakdown_spec(df_year_breakdown, selected_year):
+    chart = alt.Chart(df_year_breakdown[['Ministry Name', 'Total Budget (INR Cr)']]).mark_bar().encode(
+        x=alt.X('Total Budget (INR Cr)', title='Total Budget (INR Crore)'),
+        y=alt.Y('Ministry Name:N', sort='-x', title='Ministry'),
+        color=alt.Color('Ministry Name:N', legend=None),
+        tooltip=['Ministry Name', alt.Tooltip('Total Budget (INR Cr)', format=',.2f')]
+    ).properties(
+        title=f"Top Ministries by Budget in {selected_year}"
+    ).interactive()
+    with altair_themes.enable('none'):
+        return chart.to_dict()
+
+@st.cache_data
+def stacked_spec(df_plan_nonplan, selected_ministry):
+    chart = alt.Chart(df_plan_nonplan).mark_bar().encode(
+        x=alt.X('Start Year:O', title='Financial Year (Start)'),
+        y=alt.Y('Amount', title='Amount (INR Crore)'),
+        color='Type',
+        tooltip=['Start Year', 'Type', alt.Tooltip('Amount', format=',.2f')]
+    ).properties(
+        title=f"Plan vs. Non-Plan Expenditure for {selected_ministry}"
+    ).interactive()
+    with altair_themes.enable('none'):
+        return chart.to_dict()
+
 # Attempt to load the data
 file_path = "Budget.csv"
 try:
-    df = load_and_clean_data(file_path)
-    # Get a list of unique ministries for the sidebar filter
-    all_ministries = ['All Ministries'] + sorted(df['Ministry Name'].unique().tolist())
-    all_years = ['All Years'] + sorted(df['Start Year'].unique().tolist())
+    df = get_df(file_path)
+    # Get the sidebar filter options; categories and np.unique are both already sorted
+    all_ministries = ['All Ministries'] + df['Ministry Name'].cat.categories.tolist()
+    all_years = ['All Years'] + np.unique(df['Start Year'].to_numpy()).tolist()
     st.sidebar.success(f"Data loaded successfully!")
 
 except Exception as e:
@@ -70,14 +194,23 @@ selected_year = st.sidebar.selectbox(
     all_years
 )
 
-# Apply filters
-df_filtered = df.copy()
+# Apply filters as a single boolean mask (no full copy when nothing is filtered)
+no_filters = selected_ministry == 'All Ministries' and selected_year == 'All Years'
+
+if no_filters:
+    df_filtered = df
+else:
+    # At least one filter is active here, so combine the NumPy predicates and take once
+    mask = None
 
-if selected_ministry != 'All Ministries':
-    df_filtered = df_filtered[df_filtered['Ministry Name'] == selected_ministry]
+    if selected_ministry != 'All Ministries':
+        mask = df['Ministry Name'].values == selected_ministry
 
-if selected_year != 'All Years':
-    df_filtered = df_filtered[df_filtered['Start Year'] == selected_year]
+    if selected_year != 'All Years':
+        year_mask = df['Start Year'].values == selected_year
+        mask = year_mask if mask is None else (mask & year_mask)
+
+    df_filtered = df.loc[mask]
 
 
 # --- 3. MAIN DASHBOARD UI ---
@@ -89,10 +222,12 @@ st.markdown("---")
 # --- 4. KEY METRICS ---
 if not df_filtered.empty:
     
-    # Calculate totals for the selected filters
-    total_budget = df_filtered['Total Budget (INR Cr)'].sum()
-    total_plan = df_filtered['Total (Plan)'].sum()
-    total_non_plan = df_filtered['Total (Non-Plan)'].sum()
+    # Calculate totals for the selected filters in one reduction
+    if no_filters:
+        totals = global_totals(df)
+    else:
+        totals = df_filtered[['Total Budget (INR Cr)', 'Total (Plan)', 'Total (Non-Plan)']].to_numpy().sum(axis=0)
+    total_budget, total_plan, total_non_plan = totals
     
     col1, col2, col3 = st.columns(3)
     
@@ -126,18 +261,10 @@ with tab1:
     st.caption("Shows how the total budget has changed over the years.")
     
     # Group by year for trend analysis
-    df_trend = df.groupby('Start Year')['Total Budget (INR Cr)'].sum().reset_index()
+    df_trend = trend_by_year(df)
     
     # Line Chart
-    trend_chart = alt.Chart(df_trend).mark_line(point=True).encode(
-        x=alt.X('Start Year:O', title='Financial Year (Start)'),
-        y=alt.Y('Total Budget (INR Cr)', title='Total Budget (INR Crore)'),
-        tooltip=['Start Year', alt.Tooltip('Total Budget (INR Cr)', format=',.2f')]
-    ).properties(
-        title="Total Budget of All Ministries Over Time"
-    ).interactive() # Make the chart zoomable/pannable
-    
-    st.altair_chart(trend_chart, use_container_width=True)
+    st.vega_lite_chart(trend_spec(df_trend), use_container_width=True)
 
     
 with tab2:
@@ -147,40 +274,20 @@ with tab2:
         st.subheader(f"Budget Distribution for Year {selected_year}")
         
         # Prepare data for ministry breakdown (only for a single selected year)
-        df_year_breakdown = df_filtered.sort_values('Total Budget (INR Cr)', ascending=False).head(10)
-        
-        breakdown_chart = alt.Chart(df_year_breakdown).mark_bar().encode(
-            x=alt.X('Total Budget (INR Cr)', title='Total Budget (INR Crore)'),
-            y=alt.Y('Ministry Name', sort='-x', title='Ministry'),
-            color=alt.Color('Ministry Name', legend=None),
-            tooltip=['Ministry Name', alt.Tooltip('Total Budget (INR Cr)', format=',.2f')]
-        ).properties(
-            title=f"Top Ministries by Budget in {selected_year}"
-        ).interactive()
+        if selected_ministry == 'All Ministries':
+            df_year_breakdown = top10_by_year(df)[selected_year]
+        else:
+            df_year_breakdown = df_filtered.nlargest(10, 'Total Budget (INR Cr)')
         
-        st.altair_chart(breakdown_chart, use_container_width=True)
+        st.vega_lite_chart(breakdown_spec(df_year_breakdown, selected_year), use_container_width=True)
 
     elif selected_ministry != 'All Ministries':
         st.subheader(f"Plan vs. Non-Plan Expenditure for {selected_ministry}")
 
         # Data for stacked bar chart (Plan vs Non-Plan)
-        df_plan_nonplan = df_filtered[['Start Year', 'Total (Plan)', 'Total (Non-Plan)']].melt(
-            id_vars=['Start Year'], 
-            value_vars=['Total (Plan)', 'Total (Non-Plan)'],
-            var_name='Type',
-            value_name='Amount'
-        )
+        df_plan_nonplan = plan_nonplan_by_year(df, selected_ministry)
 
-        stacked_chart = alt.Chart(df_plan_nonplan).mark_bar().encode(
-            x=alt.X('Start Year:O', title='Financial Year (Start)'),
-            y=alt.Y('Amount', title='Amount (INR Crore)'),
-            color='Type',
-            tooltip=['Start Year', 'Type', alt.Tooltip('Amount', format=',.2f')]
-        ).properties(
-            title=f"Plan vs. Non-Plan Expenditure for {selected_ministry}"
-        ).interactive()
-
-        st.altair_chart(stacked_chart, use_container_width=True)
+        st.vega_lite_chart(stacked_spec(df_plan_nonplan, selected_ministry), use_container_width=True)
 
     else:
         st.info("Select a specific **Year** or **Ministry** in the sidebar to view a detailed breakdown chart.")
@@ -188,5 +295,12 @@ with tab2:
 
 with tab3:
     st.header("Raw Data Table")
-    st.markdown("The complete, cleaned dataset for inspection.")
-    st.dataframe(df, use_container_width=True)
+    st.markdown("The cleaned dataset for inspection.")
+
+    # Only send as many rows to the browser as the user asks for
+    max_rows = min(len(df), 5000)
+    if max_rows > 10:
+        n_rows = st.slider("Rows to display", 10, max_rows, min(100, max_rows))
+    else:
+        n_rows = max_rows
+    st.dataframe(df.head(n_rows), use_container_width=True)